@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import io
+import os
+import threading
+from functools import wraps
 from pathlib import Path
-from typing import List
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
@@ -12,15 +14,76 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from resume_analyzer.parsers import extract_text, clean_text
-from resume_analyzer.nlp import extract_skills, keywords_tfidf
-from resume_analyzer.scoring import aggregate_scores
-from resume_analyzer.suggestions import generate_suggestions
+from resume_analyzer.engine import ResumeAnalyzer, parse_sections
 from resume_analyzer import db as dbm
+from limits import LIMITS, QUEUE_TIMEOUT
 
 
 app = Flask(__name__)
 CORS(app)
+dbm.init_db()
+analyzer = ResumeAnalyzer(skills_sections=parse_sections(os.environ.get("RA_SKILLS_SECTIONS", "")))
+
+
+class ConcurrencyLimiter:
+    """Per-process cap on in-flight requests for one class of endpoint.
+
+    Up to ``limit`` requests run at once; up to ``queue_size`` more wait at most
+    ``queue_timeout`` seconds for a slot. Anything beyond that is rejected so a
+    burst of expensive calls cannot starve the rest of the worker.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = max(1, limit)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(self.limit)
+        self._lock = threading.Lock()
+        self._waiting = 0
+
+    def acquire(self) -> bool:
+        if self._slots.acquire(blocking=False):
+            return True
+        with self._lock:
+            if self._waiting >= self.queue_size:
+                return False
+            self._waiting += 1
+        try:
+            return self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def release(self) -> None:
+        self._slots.release()
+
+
+LIMITERS = {name: ConcurrencyLimiter(limit, queue_size, QUEUE_TIMEOUT) for name, (limit, queue_size) in LIMITS.items()}
+
+
+def limited(name: str):
+    """Run the view under the named limiter, answering 429 when it is saturated."""
+    limiter = LIMITERS[name]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not limiter.acquire():
+                resp = jsonify({"error": f"too many concurrent {name} requests, retry later"})
+                resp.status_code = 429
+                resp.headers["Retry-After"] = str(max(1, int(QUEUE_TIMEOUT)))
+                return resp
+            try:
+                return view(*args, **kwargs)
+            finally:
+                limiter.release()
+        return wrapper
+    return decorator
+
+
+def extract_upload(upload):
+    """Extraction (text + truncation warnings) of an uploaded file."""
+    return analyzer.extract(upload.read(), upload.filename or "")
 
 
 @app.route("/health", methods=["GET"])
@@ -29,6 +92,7 @@ def health():
 
 
 @app.route("/analyze", methods=["POST"])
+@limited("analyze")
 def analyze_single():
     """Analyze one resume with optional JD text/file."""
     files = request.files
@@ -41,62 +105,23 @@ def analyze_single():
     if not resume_file:
         return jsonify({"error": "resume file is required"}), 400
 
-    # Save to temp in memory and parse
-    # preserve suffix for parser
-    resume_name = Path(resume_file.filename or "resume").name
-    tmp_path = Path(f"tmp_{resume_name}")
-    tmp_path.write_bytes(resume_file.read())
-    resume_text = clean_text(extract_text(tmp_path))
-    tmp_path.unlink(missing_ok=True)
+    resume = extract_upload(resume_file)
+    warnings = list(resume.warnings)
 
     jd_text = jd_text_in
     if jd_file and not jd_text:
-        jd_name = Path(jd_file.filename or "jd").name
-        tmp_jd = Path(f"tmp_{jd_name}")
-        tmp_jd.write_bytes(jd_file.read())
-        jd_text = clean_text(extract_text(tmp_jd))
-        tmp_jd.unlink(missing_ok=True)
-
-    # NLP & scoring
-    skills = extract_skills(resume_text)
-    jd_keywords: List[str] = keywords_tfidf(jd_text) if jd_text else []
-    scores = aggregate_scores(resume_text, jd_text, skills, jd_keywords)
-    suggestions = generate_suggestions(resume_text, jd_text, scores, jd_keywords)
-
-    # Persist basic artifacts
-    dbm.init_db()
-    with dbm.SessionLocal() as sess:
-        r = dbm.Resume(filename=resume_file.filename, text=resume_text)
-        sess.add(r)
-        jd_id = None
-        if jd_text:
-            jd = dbm.JobDescription(title=None, text=jd_text)
-            sess.add(jd)
-            sess.flush()
-            jd_id = jd.id
-        sess.flush()
-        ar = dbm.AnalysisResult(
-            resume_id=r.id,
-            jd_id=jd_id,
-            similarity=scores.similarity,
-            skill_match=scores.skill_match,
-            keyword_coverage=scores.keyword_coverage,
-            readability=scores.readability,
-            ats_compliance=scores.ats_compliance,
-            suggestions="\n".join(suggestions),
-        )
-        sess.add(ar)
-        sess.commit()
-
-    return jsonify({
-        "skills": skills,
-        "jd_keywords": jd_keywords,
-        "scores": scores.__dict__,
-        "suggestions": suggestions,
-    })
+        jd = extract_upload(jd_file)
+        jd_text = jd.text
+        warnings += jd.warnings
+
+    result = analyzer.analyze(resume.text, jd_text)
+    result.update(analyzer.save_analysis(resume_file.filename, resume.text, jd_text, result))
+    result["warnings"] = warnings
+    return jsonify(result)
 
 
 @app.route("/rank", methods=["POST"])
+@limited("rank")
 def rank_bulk():
     """Recruiter flow: one JD and multiple resumes -> ranked list."""
     files = request.files
@@ -104,40 +129,42 @@ def rank_bulk():
     if not jd_file:
         return jsonify({"error": "JD file is required"}), 400
 
-    jd_name = Path(jd_file.filename or "jd").name
-    tmp_jd = Path(f"tmp_{jd_name}")
-    tmp_jd.write_bytes(jd_file.read())
-    jd_text = clean_text(extract_text(tmp_jd))
-    tmp_jd.unlink(missing_ok=True)
-    jd_keywords: List[str] = keywords_tfidf(jd_text)
-
-    results = []
-    for key in files:
-        if key.startswith("resume_"):
-            f = files[key]
-            tmp = Path(f"tmp_{key}")
-            tmp.write_bytes(f.read())
-            resume_text = clean_text(extract_text(tmp))
-            tmp.unlink(missing_ok=True)
-            skills = extract_skills(resume_text)
-            scores = aggregate_scores(resume_text, jd_text, skills, jd_keywords)
-            suggestions = generate_suggestions(resume_text, jd_text, scores, jd_keywords)
-            results.append({
-                "filename": f.filename,
-                "scores": scores.__dict__,
-                "skills": skills,
-                "suggestions": suggestions,
-            })
-
-    results.sort(key=lambda r: (
-        r["scores"]["similarity"] * 0.5 +
-        r["scores"]["skill_match"] * 0.3 +
-        r["scores"]["ats_compliance"] * 0.2
-    ), reverse=True)
-
-    return jsonify({"jd_keywords": jd_keywords, "results": results})
+    jd = extract_upload(jd_file)
+    # an unreadable resume is reported in its own warnings instead of failing the batch
+    resumes = [
+        (files[key].filename, analyzer.extract_or_warn(files[key].read(), files[key].filename or ""))
+        for key in files if key.startswith("resume_")
+    ]
+    result = analyzer.rank(jd.text, resumes)
+    result["warnings"] = jd.warnings
+    return jsonify(result)
+
+
+def _history_response(**filters):
+    """Keyset-paginated score history: ?limit=N (max 200) &cursor=<next_cursor>."""
+    try:
+        limit = max(1, min(200, int(request.args.get("limit", 50))))
+        cursor = request.args.get("cursor")
+        before_id = int(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "limit and cursor must be integers"}), 400
+    with dbm.SessionLocal() as sess:
+        items, next_cursor = dbm.score_history(sess, before_id=before_id, limit=limit, **filters)
+    for item in items:
+        item["created_at"] = item["created_at"].isoformat() if item["created_at"] else None
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+@app.route("/history/resumes/<int:resume_id>", methods=["GET"])
+def resume_history(resume_id: int):
+    return _history_response(resume_id=resume_id)
+
+
+@app.route("/history/jds/<int:jd_id>", methods=["GET"])
+def jd_history(jd_id: int):
+    return _history_response(jd_id=jd_id)
 
 
 if __name__ == "__main__":
-    dbm.init_db()
+    # Development server only; see backend/gunicorn.conf.py for production serving.
     app.run(host="0.0.0.0", port=8000, debug=True)
@@ -0,0 +1,41 @@
+"""Gunicorn settings for the production API.
+
+Run from the repository root:
+
+    gunicorn -c backend/gunicorn.conf.py
+
+Every value can be overridden with the environment variables below.
+"""
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+pythonpath = str(Path(__file__).resolve().parent)
+if pythonpath not in sys.path:
+    sys.path.insert(0, pythonpath)
+
+from limits import LIMITS  # noqa: E402
+
+wsgi_app = "wsgi:app"
+
+bind = os.environ.get("RA_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("RA_WORKERS", min(4, multiprocessing.cpu_count())))
+# Every running or queued request holds a thread, so by default each worker gets
+# enough for all limiter slots and queues in limits.py, plus two for cheap endpoints
+# (/health, /history). With fewer threads the queues never fill and excess
+# requests wait in gunicorn's backlog instead of getting a 429.
+worker_class = "gthread"
+threads = int(os.environ.get("RA_THREADS", sum(limit + queue_size for limit, queue_size in LIMITS.values()) + 2))
+# Import wsgi (and warm the parser/NLP stack) once before forking.
+preload_app = True
+timeout = int(os.environ.get("RA_WORKER_TIMEOUT", 300))
+graceful_timeout = 30
+max_requests = int(os.environ.get("RA_MAX_REQUESTS", 1000))
+max_requests_jitter = 100
+
+
+def post_fork(server, worker):
+    import wsgi
+
+    wsgi.after_fork()
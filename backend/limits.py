@@ -0,0 +1,22 @@
+"""Concurrency settings for the API, shared by app.py and gunicorn.conf.py.
+
+Kept free of imports with side effects so gunicorn can read them while
+loading its config, before the app (database, analyzer) is imported.
+"""
+import os
+from typing import Dict, Tuple
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+QUEUE_TIMEOUT = float(os.environ.get("RA_QUEUE_TIMEOUT", "30"))
+# endpoint class -> (requests running at once, requests waiting for a slot)
+LIMITS: Dict[str, Tuple[int, int]] = {
+    "analyze": (_env_int("RA_ANALYZE_CONCURRENCY", 4), _env_int("RA_ANALYZE_QUEUE", 16)),
+    "rank": (_env_int("RA_RANK_CONCURRENCY", 1), _env_int("RA_RANK_QUEUE", 2)),
+}
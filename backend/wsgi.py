@@ -0,0 +1,25 @@
+"""WSGI entry point for production serving.
+
+Importing this module warms the parsing/NLP stack so that, with gunicorn's
+``preload_app``, the work happens once in the master and is shared with every
+forked worker instead of being repeated on each worker's first request.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import app, analyzer  # noqa: E402
+from resume_analyzer import db as dbm  # noqa: E402
+
+
+def after_fork() -> None:
+    """Drop pooled DB connections inherited from the master process."""
+    dbm.SessionLocal.kw["bind"].dispose(close=False)
+
+
+analyzer.warm_up()
@@ -6,4 +6,7 @@ __all__ = [
     "scoring",
     "suggestions",
     "db",
+    "engine",
+    "readability",
+    "structure",
 ]
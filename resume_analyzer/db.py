@@ -1,24 +1,57 @@
 from __future__ import annotations
 
+import hashlib
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy import create_engine, String, Integer, DateTime, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy import create_engine, event, inspect, select, String, Integer, DateTime, Text, LargeBinary, ForeignKey
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.types import TypeDecorator
 
 
 DB_PATH = Path("data/app.db")
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _enable_sqlite_foreign_keys(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA foreign_keys=ON")
+    cur.close()
+
+
 def get_engine(echo: bool = False):
-    return create_engine(f"sqlite:///{DB_PATH}", echo=echo, future=True)
+    engine = create_engine(f"sqlite:///{DB_PATH}", echo=echo, future=True)
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    return engine
 
 
 SessionLocal = sessionmaker(bind=get_engine(), autoflush=False, autocommit=False, future=True)
 
 
+class CompressedText(TypeDecorator):
+    """Unicode text stored zlib-compressed in a BLOB.
+
+    Reads are transparent: models see ``str``. Rows written before compression
+    was introduced come back from SQLite as ``str`` and pass through unchanged.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), 6)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -27,7 +60,8 @@ class Resume(Base):
     __tablename__ = "resumes"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     filename: Mapped[str] = mapped_column(String(255))
-    text: Mapped[str] = mapped_column(Text)
+    text: Mapped[str] = mapped_column(CompressedText)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), unique=True, index=True, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
@@ -35,25 +69,107 @@ class JobDescription(Base):
     __tablename__ = "job_descriptions"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    text: Mapped[str] = mapped_column(Text)
+    text: Mapped[str] = mapped_column(CompressedText)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), unique=True, index=True, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    resume_id: Mapped[int] = mapped_column(Integer)
-    jd_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # The single-column indexes also serve "WHERE resume_id = ? ORDER BY id",
+    # since SQLite appends the rowid (id) to every index entry.
+    resume_id: Mapped[int] = mapped_column(Integer, ForeignKey("resumes.id"), index=True)
+    jd_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("job_descriptions.id"), nullable=True, index=True)
     similarity: Mapped[float] = mapped_column()
     skill_match: Mapped[float] = mapped_column()
     keyword_coverage: Mapped[float] = mapped_column()
     readability: Mapped[float] = mapped_column()
     ats_compliance: Mapped[float] = mapped_column()
     suggestions: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+# Columns added after the first release, created on older databases by init_db
+ADDED_COLUMNS = (
+    (Resume.__table__, "content_hash", "VARCHAR(64)"),
+    (JobDescription.__table__, "content_hash", "VARCHAR(64)"),
+)
 
 
 def init_db():
+    """Create missing tables, columns and indexes.
+
+    Indexes and ``ADDED_COLUMNS`` are also added to tables created by older
+    versions; their foreign keys are not, since SQLite can only add those by
+    rebuilding the table.
+    """
     engine = get_engine()
     Base.metadata.create_all(engine)
+    existing = inspect(engine)
+    with engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            if column not in {c["name"] for c in existing.get_columns(table.name)}:
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column} {ddl}")
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
+
+
+def text_hash(text: str) -> str:
+    """Dedup key for stored resume/JD text (callers pass the cleaned text)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_or_create_text(sess: Session, model, text: str, **fields) -> int:
+    """Id of the ``model`` row holding ``text``, inserting it on first sight.
+
+    Rows are keyed on ``content_hash``; ``fields`` (filename, title) only apply
+    to the first insert. ``ON CONFLICT DO NOTHING`` keeps concurrent writers of
+    the same text from failing on the unique index.
+    """
+    digest = text_hash(text)
+    lookup = select(model.id).where(model.content_hash == digest)
+    row_id = sess.execute(lookup).scalar_one_or_none()
+    if row_id is None:
+        sess.execute(
+            sqlite_insert(model)
+            .values(text=text, content_hash=digest, **fields)
+            .on_conflict_do_nothing(index_elements=["content_hash"])
+        )
+        row_id = sess.execute(lookup).scalar_one()
+    return row_id
+
+
+HISTORY_COLUMNS = (
+    AnalysisResult.id,
+    AnalysisResult.resume_id,
+    AnalysisResult.jd_id,
+    AnalysisResult.similarity,
+    AnalysisResult.skill_match,
+    AnalysisResult.keyword_coverage,
+    AnalysisResult.readability,
+    AnalysisResult.ats_compliance,
+    AnalysisResult.created_at,
+)
+
+
+def score_history(sess: Session, resume_id: Optional[int] = None, jd_id: Optional[int] = None,
+                  before_id: Optional[int] = None, limit: int = 50) -> Tuple[List[dict], Optional[int]]:
+    """Newest-first score rows for a resume and/or JD, one keyset page at a time.
+
+    Only score columns are selected, never resume/JD text or suggestions. Pass the
+    returned cursor back as ``before_id`` for the next page; it is None on the last.
+    """
+    stmt = select(*HISTORY_COLUMNS)
+    if resume_id is not None:
+        stmt = stmt.where(AnalysisResult.resume_id == resume_id)
+    if jd_id is not None:
+        stmt = stmt.where(AnalysisResult.jd_id == jd_id)
+    if before_id is not None:
+        stmt = stmt.where(AnalysisResult.id < before_id)
+    stmt = stmt.order_by(AnalysisResult.id.desc()).limit(limit + 1)
+    rows = [dict(r) for r in sess.execute(stmt).mappings()]
+    next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .parsers import Extraction, extract_text, extract_document_from_bytes, clean_text
+from .nlp import extract_skills, keywords_tfidf
+from .scoring import MatchScores, aggregate_scores
+from .readability import token_stats
+from .suggestions import generate_suggestions
+from .structure import SECTION_ALIASES, analyze_structure
+from . import db as dbm
+
+
+WARMUP_SAMPLE = Path(__file__).resolve().parents[1] / "assets" / "templates" / "ATS_Template.txt"
+
+
+def composite_score(scores: Dict[str, float]) -> float:
+    """Weighted score used to order candidates in the recruiter flow."""
+    return (
+        scores["similarity"] * 0.5 +
+        scores["skill_match"] * 0.3 +
+        scores["ats_compliance"] * 0.2
+    )
+
+
+def parse_sections(value: str) -> Tuple[str, ...]:
+    """Section names from a comma-separated setting such as ``RA_SKILLS_SECTIONS``."""
+    names = tuple(n.strip().lower() for n in value.split(",") if n.strip())
+    unknown = [n for n in names if n not in SECTION_ALIASES]
+    if unknown:
+        raise ValueError(f"Unknown resume sections {unknown}; expected any of {', '.join(SECTION_ALIASES)}")
+    return names
+
+
+def failed_extraction(filename: str, error: Exception) -> Extraction:
+    """Empty ``Extraction`` standing in for an unreadable file, with the error as its warning."""
+    message = str(error)
+    if not message.startswith(f"{filename}:"):
+        message = f"{filename}: {message}"
+    return Extraction(text="", truncated=True, warnings=[f"{message} (not scored)"])
+
+
+class ResumeAnalyzer:
+    """The full parse -> NLP -> scoring pipeline, shared by the API and dashboards.
+
+    Results are plain dicts shaped like the API's JSON responses, so callers can
+    switch between HTTP and in-process use without touching their rendering.
+
+    Texts should be passed as extracted (see ``parse``): line breaks are needed
+    to find section headings and bullets, and are collapsed here before scoring.
+    ``skills_sections`` restricts skill extraction to those sections (e.g.
+    ``("skills",)``) when the resume has them; by default the whole text is used.
+    """
+
+    def __init__(self, known_skills: Optional[Set[str]] = None, skills_sections: Optional[Sequence[str]] = None):
+        self.known_skills = known_skills
+        self.skills_sections = tuple(skills_sections or ())
+
+    def warm_up(self) -> None:
+        """Import lazily-loaded heavy modules and run the pipeline once."""
+        # pdfminer pulls in its layout/interpreter machinery on first use
+        import pdfminer.converter  # noqa: F401
+        import pdfminer.layout  # noqa: F401
+        import pdfminer.pdfinterp  # noqa: F401
+        import pdfminer.pdfpage  # noqa: F401
+
+        text = extract_text(WARMUP_SAMPLE)
+        self.analyze(text, text)
+
+    def extract(self, data: bytes, filename: str) -> Extraction:
+        """Raw extracted text, line breaks intact, plus any truncation warnings."""
+        return extract_document_from_bytes(data, filename)
+
+    def extract_or_warn(self, data: bytes, filename: str) -> Extraction:
+        """Like ``extract``, but an unreadable file yields ``failed_extraction`` instead of raising."""
+        try:
+            return self.extract(data, filename)
+        except (ValueError, RuntimeError) as e:
+            return failed_extraction(filename, e)
+
+    def parse(self, data: bytes, filename: str) -> str:
+        return self.extract(data, filename).text
+
+    def analyze(self, resume_text: str, jd_text: str = "", jd_keywords: Optional[List[str]] = None) -> dict:
+        structure = analyze_structure(resume_text)
+        # clean_text's whitespace split, kept so readability needs no second tokenization
+        tokens = resume_text.split()
+        resume_text = " ".join(tokens)
+        jd_text = clean_text(jd_text) if jd_text else ""
+        if jd_keywords is None:
+            jd_keywords = keywords_tfidf(jd_text) if jd_text else []
+        skills_text = structure.section_text(*self.skills_sections) if self.skills_sections else None
+        skills = extract_skills(skills_text or resume_text, self.known_skills)
+        scores = aggregate_scores(resume_text, jd_text, skills, jd_keywords, structure=structure,
+                                  stats=token_stats(tokens))
+        suggestions = generate_suggestions(resume_text, jd_text, scores, jd_keywords, structure=structure)
+        return {
+            "skills": skills,
+            "jd_keywords": jd_keywords,
+            "scores": scores.__dict__,
+            "suggestions": suggestions,
+        }
+
+    def analyze_pages(self, pages: Iterable[str], jd_text: str = "",
+                      jd_keywords: Optional[List[str]] = None) -> Iterator[dict]:
+        """Analyze a document while its pages arrive (e.g. from ``parsers.open_pdf_pages``).
+
+        Yields a preliminary ``analyze`` result for the first page, marked
+        ``"partial": True``, then the result for the whole text with ``"partial": False``.
+        """
+        if jd_text and jd_keywords is None:
+            jd_keywords = keywords_tfidf(clean_text(jd_text))
+        text = ""
+        for i, page in enumerate(pages):
+            text += page
+            if i == 0:
+                yield {**self.analyze(text, jd_text, jd_keywords), "partial": True}
+        yield {**self.analyze(text, jd_text, jd_keywords), "partial": False}
+
+    def rank(self, jd_text: str, resumes: Iterable[Tuple[str, Union[str, Extraction]]]) -> dict:
+        """Score ``(filename, resume_text)`` pairs against one JD, best first.
+
+        Passing an ``Extraction`` instead of text carries its warnings into the result.
+        Documents without text (e.g. from ``extract_or_warn``) are listed last with zero
+        scores rather than analyzed.
+        """
+        jd_text = clean_text(jd_text)
+        jd_keywords: List[str] = keywords_tfidf(jd_text)
+        results = []
+        for filename, doc in resumes:
+            if not isinstance(doc, Extraction):
+                doc = Extraction(text=doc)
+            if doc.text.strip():
+                res = self.analyze(doc.text, jd_text, jd_keywords)
+            else:
+                res = {"scores": MatchScores(0.0, 0.0, 0.0, 0.0, 0.0).__dict__, "skills": [], "suggestions": []}
+            results.append({
+                "filename": filename,
+                "scores": res["scores"],
+                "skills": res["skills"],
+                "suggestions": res["suggestions"],
+                "warnings": doc.warnings,
+            })
+        results.sort(key=lambda r: composite_score(r["scores"]), reverse=True)
+        return {"jd_keywords": jd_keywords, "results": results}
+
+    def save_analysis(self, filename: Optional[str], resume_text: str, jd_text: str, result: dict) -> Dict[str, Optional[int]]:
+        """Persist one ``analyze`` result; returns the analysis/resume/JD ids.
+
+        Resumes and JDs are stored once per distinct cleaned text, so re-analyzing
+        the same document adds to its score history instead of a new row.
+        """
+        scores = result["scores"]
+        with dbm.SessionLocal() as sess:
+            resume_id = dbm.get_or_create_text(sess, dbm.Resume, clean_text(resume_text), filename=filename)
+            jd_id = None
+            if jd_text:
+                jd_id = dbm.get_or_create_text(sess, dbm.JobDescription, clean_text(jd_text), title=None)
+            ar = dbm.AnalysisResult(
+                resume_id=resume_id,
+                jd_id=jd_id,
+                similarity=scores["similarity"],
+                skill_match=scores["skill_match"],
+                keyword_coverage=scores["keyword_coverage"],
+                readability=scores["readability"],
+                ats_compliance=scores["ats_compliance"],
+                suggestions="\n".join(result["suggestions"]),
+            )
+            sess.add(ar)
+            sess.commit()
+            return {"analysis_id": ar.id, "resume_id": resume_id, "jd_id": jd_id}
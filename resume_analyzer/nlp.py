@@ -3,14 +3,12 @@ from __future__ import annotations
 from typing import List, Set
 import re
 
+from .structure import analyze_structure
+
 
 def extract_entities(text: str) -> dict:
-    """Very lightweight entity extraction using regex heuristics."""
-    ents = {"EMAIL": [], "PHONE": [], "URL": []}
-    ents["EMAIL"] = re.findall(r"[\w\.\-]+@[\w\.-]+", text)
-    ents["PHONE"] = re.findall(r"(?:\+?\d[\s-]?)?(?:\(?\d{3}\)?[\s-]?)?\d{3}[\s-]?\d{4}", text)
-    ents["URL"] = re.findall(r"https?://\S+", text)
-    return ents
+    """Very lightweight entity extraction using regex heuristics (one precompiled scan)."""
+    return analyze_structure(text).entities
 
 
 DEFAULT_SKILLS: Set[str] = {
@@ -1,33 +1,293 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+from dataclasses import dataclass, field
+from io import StringIO
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional
 
 import docx2txt
-from pdfminer.high_level import extract_text as pdf_extract_text
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 
 
-def extract_text(file_path: str | Path) -> str:
-    """Extract text from PDF, DOCX, or TXT files.
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.environ.get(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+# Defaults for every PDF parsed through extract_text/extract_document.
+# A value <= 0 (e.g. RA_PDF_MAX_PAGES=0) disables that limit.
+PDF_MAX_PAGES = int(_env_float("RA_PDF_MAX_PAGES", 20))
+PDF_CPU_BUDGET = _env_float("RA_PDF_CPU_BUDGET", 10.0)
+# Opt-in: a positive value parses each PDF in a child process killed at the deadline.
+PDF_TIME_LIMIT = _env_float("RA_PDF_TIME_LIMIT", 0.0)
+PDF_LAYOUT = os.environ.get("RA_PDF_LAYOUT", "1").lower() not in {"0", "false", "no"}
+
+
+@dataclass
+class Extraction:
+    """Text of one document plus why it may be incomplete."""
+
+    text: str
+    pages: int = 0
+    truncated: bool = False
+    warnings: List[str] = field(default_factory=list)
+
+
+class PdfPageStream:
+    """Iterate over a PDF's text one page at a time.
+
+    Stops early, recording a warning and setting ``truncated``, once
+    ``max_pages`` pages are read or the thread has used ``cpu_budget`` seconds
+    of CPU time. The budget is checked between pages and the first page is
+    always read, so one pathological page can still overrun it; use
+    ``IsolatedPdfPageStream`` for a hard limit. ``layout=False`` skips pdfminer's
+    layout analysis: much faster, but text follows content-stream order and may
+    lose line breaks.
+    """
+
+    def __init__(self, file_path: str | Path, max_pages: Optional[int] = None,
+                 layout: bool = True, cpu_budget: Optional[float] = None, name: Optional[str] = None):
+        self.path = Path(file_path)
+        self.name = name or self.path.name
+        self.max_pages = max_pages if max_pages and max_pages > 0 else None
+        self.layout = layout
+        self.cpu_budget = cpu_budget if cpu_budget and cpu_budget > 0 else None
+        self.pages = 0
+        self.truncated = False
+        self.warnings: List[str] = []
+
+    def _stop(self, message: str) -> None:
+        self.truncated = True
+        self.warnings.append(message)
+
+    def __iter__(self) -> Iterator[str]:
+        start = time.thread_time()
+        with open(self.path, "rb") as fp:
+            rsrcmgr = PDFResourceManager(caching=True)
+            output = StringIO()
+            device = TextConverter(rsrcmgr, output, laparams=LAParams() if self.layout else None)
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            pages = PDFPage.get_pages(fp, caching=True)
+            try:
+                while True:
+                    try:
+                        page = next(pages, None)
+                        if page is None:
+                            return
+                        if self.max_pages is not None and self.pages >= self.max_pages:
+                            self._stop(f"{self.name}: only the first {self.max_pages} pages were read")
+                            return
+                        if self.pages and self.cpu_budget is not None and time.thread_time() - start > self.cpu_budget:
+                            self._stop(f"{self.name}: stopped after {self.pages} pages, "
+                                       f"CPU budget of {self.cpu_budget:g}s exhausted")
+                            return
+                        interpreter.process_page(page)
+                    except Exception as e:
+                        # malformed page or page tree: keep what was read, if anything
+                        if not self.pages:
+                            raise RuntimeError("Failed to parse PDF with pdfminer.six") from e
+                        self._stop(f"{self.name}: stopped after page {self.pages}, the rest could not be parsed")
+                        return
+                    self.pages += 1
+                    text = output.getvalue()
+                    output.seek(0)
+                    output.truncate()
+                    yield text
+            finally:
+                device.close()
+
+
+_MP = None
+
+
+def _mp_context():
+    """Context for isolated extraction, set up on first use.
+
+    forkserver children start from a clean, single-threaded process, which matters
+    inside threaded gunicorn workers and Streamlit; Windows only has spawn. The
+    server preloads pdfminer (listed itself since the server may not see this
+    package's path), so each child starts warm.
+    """
+    global _MP
+    if _MP is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload([__name__, "pdfminer.converter", "pdfminer.layout",
+                                        "pdfminer.pdfinterp", "pdfminer.pdfpage"])
+        else:
+            ctx = multiprocessing.get_context("spawn")
+        _MP = ctx
+    return _MP
+
+
+def _send_pages(out, path: str, max_pages: Optional[int], layout: bool,
+                cpu_budget: Optional[float], name: str) -> None:
+    """Child side of ``IsolatedPdfPageStream``: one message per page, then a summary."""
+    stream = PdfPageStream(path, max_pages=max_pages, layout=layout, cpu_budget=cpu_budget, name=name)
+    try:
+        for text in stream:
+            out.put(("page", text))
+    except Exception as e:
+        out.put(("error", f"{e}: {e.__cause__}" if e.__cause__ else str(e)))
+        return
+    out.put(("done", stream.truncated, stream.warnings))
+
+
+class IsolatedPdfPageStream(PdfPageStream):
+    """``PdfPageStream`` run in a child process under a wall-clock ``time_limit``.
+
+    Pages are yielded as the child finishes them. At the deadline the child is
+    killed and iteration ends with the pages read so far and a warning, or
+    raises RuntimeError if not even the first page was done. Closing the
+    iterator early also stops the child.
 
-    Uses PyMuPDF (fitz) for PDFs, docx2txt for DOCX, and utf-8 decode for TXT.
+    Where no child can be started (e.g. inside a daemonic ``multiprocessing.Pool``
+    worker), the PDF is parsed in-process under the CPU budget instead.
+    """
+
+    def __init__(self, file_path: str | Path, max_pages: Optional[int] = None, layout: bool = True,
+                 cpu_budget: Optional[float] = None, name: Optional[str] = None, time_limit: float = 30.0):
+        super().__init__(file_path, max_pages=max_pages, layout=layout, cpu_budget=cpu_budget, name=name)
+        self.time_limit = time_limit
+
+    def _failed(self, message: str) -> None:
+        if not self.pages:
+            raise RuntimeError(message)
+        self._stop(f"{self.name}: stopped after page {self.pages}, the rest could not be parsed")
+
+    def __iter__(self) -> Iterator[str]:
+        if multiprocessing.current_process().daemon:
+            yield from super().__iter__()
+            return
+        try:
+            ctx = _mp_context()
+            out = ctx.Queue()
+            proc = ctx.Process(
+                target=_send_pages, daemon=True,
+                args=(out, str(self.path), self.max_pages, self.layout, self.cpu_budget, self.name),
+            )
+            proc.start()
+        except (OSError, AssertionError, RuntimeError):
+            # no child possible here (daemonic parent, bootstrapping an unguarded main script)
+            yield from super().__iter__()
+            return
+        # started after launching the child, so forkserver/spawn startup is not billed
+        deadline = time.monotonic() + self.time_limit
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    if not self.pages:
+                        raise RuntimeError(f"{self.name}: no PDF page could be parsed within {self.time_limit:g}s")
+                    self._stop(f"{self.name}: stopped after {self.pages} pages, "
+                               f"time limit of {self.time_limit:g}s exceeded")
+                    return
+                try:
+                    # short waits so a crashed child is noticed before the deadline
+                    kind, *payload = out.get(timeout=min(remaining, 0.5))
+                except queue.Empty:
+                    if not proc.is_alive() and out.empty():
+                        self._failed("Failed to parse PDF with pdfminer.six: extraction process died")
+                        return
+                    continue
+                if kind == "page":
+                    self.pages += 1
+                    yield payload[0]
+                elif kind == "done":
+                    self.truncated, self.warnings = payload
+                    return
+                else:
+                    self._failed(payload[0])
+                    return
+        finally:
+            if proc.is_alive():
+                proc.kill()
+            try:
+                proc.join()
+            except ChildProcessError:  # already reaped, e.g. SIGCHLD set to SIG_IGN
+                pass
+            out.close()
+
+
+def open_pdf_pages(file_path: str | Path, name: Optional[str] = None, max_pages: Optional[int] = PDF_MAX_PAGES,
+                   layout: bool = PDF_LAYOUT, cpu_budget: Optional[float] = PDF_CPU_BUDGET,
+                   time_limit: Optional[float] = PDF_TIME_LIMIT) -> PdfPageStream:
+    """Page stream under the PDF_* defaults; a positive ``time_limit`` isolates it in a child process."""
+    if time_limit and time_limit > 0:
+        return IsolatedPdfPageStream(file_path, max_pages=max_pages, layout=layout,
+                                     cpu_budget=cpu_budget, name=name, time_limit=time_limit)
+    return PdfPageStream(file_path, max_pages=max_pages, layout=layout, cpu_budget=cpu_budget, name=name)
+
+
+def extract_pdf(file_path: str | Path, max_pages: Optional[int] = None, layout: bool = True,
+                cpu_budget: Optional[float] = None, name: Optional[str] = None,
+                time_limit: Optional[float] = None) -> Extraction:
+    """Read a whole PDF page by page; a positive ``time_limit`` runs it in a child process."""
+    stream = open_pdf_pages(file_path, name=name, max_pages=max_pages, layout=layout,
+                            cpu_budget=cpu_budget, time_limit=time_limit)
+    text = "".join(stream)
+    return Extraction(text=text, pages=stream.pages, truncated=stream.truncated, warnings=stream.warnings)
+
+
+def extract_document(file_path: str | Path, name: Optional[str] = None) -> Extraction:
+    """Extract text from PDF, DOCX, or TXT files, with any truncation warnings.
+
+    PDFs go through pdfminer.six page by page (see ``open_pdf_pages``) under the
+    PDF_* defaults; DOCX uses docx2txt and TXT a utf-8 decode.
+    ``name`` labels warnings (defaults to the file name).
     """
     path = Path(file_path)
     suffix = path.suffix.lower()
     if suffix == ".pdf":
         # Use pdfminer.six for broader compatibility (pure Python)
-        try:
-            return pdf_extract_text(str(path)) or ""
-        except Exception as e:
-            raise RuntimeError("Failed to parse PDF with pdfminer.six") from e
+        return extract_pdf(path, max_pages=PDF_MAX_PAGES, layout=PDF_LAYOUT, cpu_budget=PDF_CPU_BUDGET,
+                           name=name, time_limit=PDF_TIME_LIMIT)
     elif suffix in {".docx"}:
-        return docx2txt.process(str(path)) or ""
+        return Extraction(text=docx2txt.process(str(path)) or "")
     elif suffix in {".txt"}:
-        return path.read_text(encoding="utf-8", errors="ignore")
+        return Extraction(text=path.read_text(encoding="utf-8", errors="ignore"))
     else:
         raise ValueError(f"Unsupported file type: {suffix}")
 
 
+def extract_text(file_path: str | Path) -> str:
+    """Extract text from PDF, DOCX, or TXT files (see ``extract_document``)."""
+    return extract_document(file_path).text
+
+
+def extract_document_from_bytes(data: bytes, filename: str) -> Extraction:
+    """Extract an in-memory upload, using ``filename`` for its type.
+
+    The bytes go to a private temp file (the parsers want a path), so concurrent
+    callers never see each other's data.
+    """
+    suffix = Path(filename or "").suffix
+    fd, name = tempfile.mkstemp(prefix="ra_", suffix=suffix)
+    tmp_path = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        return extract_document(tmp_path, name=filename or None)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def extract_text_from_bytes(data: bytes, filename: str) -> str:
+    """Extract text from an in-memory upload (see ``extract_document_from_bytes``)."""
+    return extract_document_from_bytes(data, filename).text
+
+
 def clean_text(text: str) -> str:
     """Basic cleanup: normalize whitespace."""
     return " ".join(text.split())
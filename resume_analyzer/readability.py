@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+import math
+import re
+
+try:
+    from pyphen import Pyphen
+    _HYPHENATOR = Pyphen(lang="en_US")
+except Exception:  # pyphen missing or without the en_US dictionary
+    _HYPHENATOR = None
+
+
+# Same English constants as textstat.flesch_reading_ease
+FRE_BASE = 206.835
+FRE_SENTENCE_LENGTH = 1.015
+FRE_SYLLABLES_PER_WORD = 84.6
+
+# Documented agreement with textstat 0.7.4, checked by scripts/check_readability.py:
+# |flesch_reading_ease(t) - textstat.flesch_reading_ease(t)| <= FLESCH_TOLERANCE.
+# Counts and rounding follow textstat, so scores match up to float noise in the
+# final 2-decimal rounding.
+FLESCH_TOLERANCE = 0.01
+
+_PUNCT = re.compile(r"[^\w\s]")
+_SENTENCE_END = re.compile(r"[.!?]+")
+_WORD_CHAR = re.compile(r"\w")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+@dataclass
+class TextStats:
+    """Word/sentence/syllable counts from one tokenization pass, textstat-compatible.
+
+    Words are whitespace tokens with punctuation removed (``"C++"`` -> ``"c"``,
+    ``"end-to-end"`` is one word). Sentences are runs of text between ``.!?``;
+    as in textstat, runs of two words or fewer (headings, "e.g.", decimals) are
+    not counted.
+    """
+
+    words: int = 0
+    sentences: int = 0
+    syllables: int = 0
+
+    @property
+    def words_per_sentence(self) -> float:
+        return self.words / max(1, self.sentences)
+
+    @property
+    def syllables_per_word(self) -> float:
+        return self.syllables / self.words if self.words else 0.0
+
+
+@lru_cache(maxsize=65536)
+def syllable_count(word: str) -> int:
+    """Syllables in one lowercase, punctuation-free word.
+
+    Uses pyphen hyphenation points + 1, exactly as textstat does; without
+    pyphen, falls back to counting vowel groups (less faithful to textstat).
+    """
+    if _HYPHENATOR is not None:
+        return len(_HYPHENATOR.positions(word)) + 1
+    count = len(_VOWEL_GROUPS.findall(word))
+    if count > 1 and word.endswith("e") and not word.endswith(("le", "ee", "ye")):
+        count -= 1  # silent final e: "make", "source"
+    return max(1, count)
+
+
+def token_stats(tokens: Iterable[str]) -> TextStats:
+    """``TextStats`` from whitespace tokens, e.g. the ``text.split()`` already done by ``clean_text``."""
+    stats = TextStats()
+    in_sentence = 0
+    for tok in tokens:
+        core = _PUNCT.sub("", tok)
+        if core:
+            stats.words += 1
+            stats.syllables += syllable_count(core.lower())
+        pieces = _SENTENCE_END.split(tok)
+        for i, piece in enumerate(pieces):
+            if _WORD_CHAR.search(piece):
+                in_sentence += 1
+            if i < len(pieces) - 1 and in_sentence:
+                stats.sentences += in_sentence > 2
+                in_sentence = 0
+    stats.sentences += in_sentence > 2
+    stats.sentences = max(1, stats.sentences)
+    return stats
+
+
+def text_stats(text: str) -> TextStats:
+    return token_stats(text.split())
+
+
+def _legacy_round(number: float, points: int) -> float:
+    """textstat's rounding: half away from zero at ``points`` decimals."""
+    p = 10 ** points
+    return math.floor(number * p + math.copysign(0.5, number)) / p
+
+
+def flesch_from_stats(stats: TextStats) -> float:
+    """Flesch Reading Ease, rounded like textstat; 0.0 for text without words (textstat gives 206.835).
+
+    As in textstat, the sentence length and syllables per word are rounded to one
+    decimal before being combined, and the score to two.
+    """
+    if not stats.words:
+        return 0.0
+    return _legacy_round(
+        FRE_BASE
+        - FRE_SENTENCE_LENGTH * _legacy_round(stats.words_per_sentence, 1)
+        - FRE_SYLLABLES_PER_WORD * _legacy_round(stats.syllables_per_word, 1),
+        2,
+    )
+
+
+def flesch_reading_ease(text: str) -> float:
+    return flesch_from_stats(text_stats(text))
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 import math
 import re
 
+from .structure import ResumeStructure, SECTION_ALIASES, analyze_structure
+from .readability import TextStats, flesch_from_stats, text_stats
+
 
 @dataclass
 class MatchScores:
@@ -41,15 +44,24 @@ def tfidf_cosine_similarity(a: str, b: str) -> float:
     return float(max(0.0, min(1.0, dot/(na*nb))))
 
 
-def ats_checks(text: str, required_sections: List[str] | None = None) -> Dict[str, bool | float]:
+def ats_checks(text: str, required_sections: List[str] | None = None,
+               structure: Optional[ResumeStructure] = None) -> Dict[str, bool | float]:
     """Simple ATS heuristics.
-    - Section presence: Education, Experience, Skills, Projects.
+    - Section presence: Education, Experience, Skills, Projects headings.
     - Keyword density: ratio of non-stopword tokens.
-    - Bullet usage: count of '-' or '•'.
+    - Bullet usage: count of line-leading '-' or '•'.
+
+    Pass ``structure`` (from the raw, line-preserving text) to reuse an existing
+    segmentation; otherwise ``text`` is segmented here.
     """
     t = text.lower()
+    structure = structure or analyze_structure(text)
     sections = required_sections or ["education", "experience", "skills", "projects"]
-    section_presence = {s: (s in t) for s in sections}
+    # Sections without known heading spellings fall back to a whole-word search
+    section_presence = {
+        s: structure.has_section(s) if s.lower() in SECTION_ALIASES else bool(re.search(rf"\b{re.escape(s.lower())}\b", t))
+        for s in sections
+    }
 
     words = re.findall(r"[a-zA-Z]+", t)
     stop = {
@@ -57,7 +69,7 @@ def ats_checks(text: str, required_sections: List[str] | None = None) -> Dict[st
     }
     non_stop = [w for w in words if w not in stop]
     density = (len(non_stop) / max(1, len(words))) if words else 0.0
-    bullets = len(re.findall(r"(^|\n)[\-•]", text))
+    bullets = structure.bullet_count
 
     score = (
         0.5 * (sum(section_presence.values()) / len(sections)) +
@@ -73,17 +85,16 @@ def ats_checks(text: str, required_sections: List[str] | None = None) -> Dict[st
     }
 
 
-def readability_score(text: str) -> float:
-    try:
-        import textstat
-        fk = textstat.flesch_reading_ease(text)
-        # Normalize Flesch score (~0-100) to 0-1
-        return float(max(0.0, min(1.0, fk / 100.0)))
-    except Exception:
-        return 0.5
+def readability_score(text: str, stats: Optional[TextStats] = None) -> float:
+    """Flesch Reading Ease normalized to 0-1; ``stats`` reuses counts from an earlier tokenization."""
+    fk = flesch_from_stats(stats or text_stats(text))
+    # Normalize Flesch score (~0-100) to 0-1
+    return float(max(0.0, min(1.0, fk / 100.0)))
 
 
-def aggregate_scores(resume_text: str, jd_text: str, skills_found: List[str], jd_keywords: List[str]) -> MatchScores:
+def aggregate_scores(resume_text: str, jd_text: str, skills_found: List[str], jd_keywords: List[str],
+                     structure: Optional[ResumeStructure] = None,
+                     stats: Optional[TextStats] = None) -> MatchScores:
     sim = tfidf_cosine_similarity(resume_text, jd_text) if jd_text else 0.0
     jd_kw_set = set([k.lower() for k in jd_keywords])
     skills_set = set([s.lower() for s in skills_found])
@@ -94,8 +105,8 @@ def aggregate_scores(resume_text: str, jd_text: str, skills_found: List[str], jd
         covered = sum(1 for k in jd_kw_set if k in resume_text.lower())
         keyword_coverage = covered / len(jd_kw_set)
 
-    ats = ats_checks(resume_text)
-    read = readability_score(resume_text)
+    ats = ats_checks(resume_text, structure=structure)
+    read = readability_score(resume_text, stats)
 
     return MatchScores(
         similarity=float(sim),
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import re
+
+
+# Canonical section name -> heading spellings recognised at the start of a line.
+SECTION_ALIASES: Dict[str, tuple] = {
+    "summary": ("summary", "professional summary", "profile", "objective", "career objective", "about me"),
+    "education": ("education", "academic background", "academics", "qualifications", "academic qualifications"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "skills & tools", "tools"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments"),
+}
+
+_ALIAS_TO_SECTION = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+# Longest first so "work experience" wins over "experience"
+_HEADING_ALT = "|".join(re.escape(a) for a in sorted(_ALIAS_TO_SECTION, key=len, reverse=True))
+
+# One pass over the text finds everything; alternation order settles overlaps
+# (a URL's digits are never also reported as a phone number).
+_SCANNER = re.compile(
+    rf"(?P<heading>^[ \t]*#*[ \t]*(?P<title>{_HEADING_ALT})[ \t\r]*(?::|$))"
+    r"|(?P<bullet>^[ \t]*[\-•▪●◦*])"
+    r"|(?P<url>https?://\S+)"
+    r"|(?P<email>[\w\.\-]+@[\w\.-]+)"
+    # Phones need a full 10-digit number: NANP 3-3-4 or 5-5 (e.g. India), with an
+    # optional +country code. Date ranges such as "2019-2023" have too few digits.
+    r"|(?P<phone>(?<![\w-])(?:\+\d{1,3}[\s.-]?)?"
+    r"(?:(?:\(\d{3}\)[\s.-]?|\d{3}[\s.-]?)\d{3}[\s.-]?\d{4}|\d{5}[\s.-]?\d{5})(?![\w-]))",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Fallback for whitespace-collapsed text where headings no longer sit on their own line:
+# only Title Case or UPPER CASE spellings count, so "skills" mid-sentence does not.
+_INLINE_HEADING = re.compile(r"\b(?P<title>{})\b".format("|".join(
+    re.escape(v) for a in sorted(_ALIAS_TO_SECTION, key=len, reverse=True) for v in (a.title(), a.upper())
+)))
+_INLINE_BULLET = re.compile(r"(?:^|\s)[•▪●◦](?=\s)")
+
+_ENTITY_KINDS = {"email": "EMAIL", "phone": "PHONE", "url": "URL"}
+
+
+@dataclass
+class ResumeStructure:
+    """Sections, contact entities and bullet count found in one scan of a resume."""
+
+    sections: Dict[str, str] = field(default_factory=dict)
+    headings: List[str] = field(default_factory=list)
+    preamble: str = ""
+    entities: Dict[str, List[str]] = field(default_factory=lambda: {"EMAIL": [], "PHONE": [], "URL": []})
+    bullet_count: int = 0
+
+    def has_section(self, name: str) -> bool:
+        return name.lower() in self.sections
+
+    def section_text(self, *names: str) -> Optional[str]:
+        """Joined body of the named sections, or None if none of them exist."""
+        parts = [self.sections[n.lower()] for n in names if n.lower() in self.sections]
+        return "\n".join(parts) if parts else None
+
+
+def analyze_structure(text: str) -> ResumeStructure:
+    """Segment ``text`` into sections and collect entities and bullets in one pass.
+
+    Headings are recognised on their own line (optionally followed by ':' and
+    content). For text whose line breaks were collapsed, section boundaries fall
+    back to the first Title/UPPER case whole-word occurrence of each heading.
+    """
+    res = ResumeStructure()
+    marks = []  # (heading_start, body_start, section)
+    for m in _SCANNER.finditer(text):
+        kind = m.lastgroup
+        if m.group("heading") is not None:
+            section = _ALIAS_TO_SECTION[m.group("title").lower()]
+            marks.append((m.start(), m.end(), section))
+        elif kind == "bullet":
+            res.bullet_count += 1
+        else:
+            res.entities[_ENTITY_KINDS[kind]].append(m.group())
+
+    if not marks and "\n" not in text.strip():
+        seen = set()
+        for m in _INLINE_HEADING.finditer(text):
+            section = _ALIAS_TO_SECTION[m.group("title").lower()]
+            if section not in seen:
+                seen.add(section)
+                marks.append((m.start(), m.end(), section))
+        res.bullet_count += len(_INLINE_BULLET.findall(text))
+
+    res.preamble = text[:marks[0][0]].strip() if marks else text.strip()
+    for i, (_, body_start, section) in enumerate(marks):
+        body_end = marks[i + 1][0] if i + 1 < len(marks) else len(text)
+        body = text[body_start:body_end].strip()
+        res.headings.append(section)
+        res.sections[section] = f"{res.sections[section]}\n{body}" if section in res.sections else body
+    return res
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from .scoring import ats_checks, MatchScores
+from .structure import ResumeStructure
 
 
-def generate_suggestions(resume_text: str, jd_text: str | None, scores: MatchScores, jd_keywords: List[str]) -> List[str]:
+def generate_suggestions(resume_text: str, jd_text: str | None, scores: MatchScores, jd_keywords: List[str],
+                         structure: Optional[ResumeStructure] = None) -> List[str]:
     tips: List[str] = []
-    ats = ats_checks(resume_text)
+    ats = ats_checks(resume_text, structure=structure)
 
     # Section tips
     for section, present in ats["section_presence"].items():
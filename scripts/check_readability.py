@@ -0,0 +1,42 @@
+import sys
+import time
+from pathlib import Path
+
+# Add project root to sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from resume_analyzer.parsers import clean_text
+from resume_analyzer.readability import FLESCH_TOLERANCE, flesch_reading_ease
+
+CORPUS = sorted((ROOT / "assets" / "readability_corpus").glob("*.txt")) + [ROOT / "assets" / "templates" / "ATS_Template.txt"]
+
+# Checks the built-in Flesch engine against textstat (pip install -r requirements-dev.txt).
+# Texts are scored both as written and whitespace-collapsed, as the pipeline sees them.
+# Exits non-zero if any document differs by more than FLESCH_TOLERANCE.
+if __name__ == "__main__":
+    try:
+        import textstat
+    except ImportError:
+        sys.exit("textstat is not installed: pip install -r requirements-dev.txt")
+
+    texts, names = [], []
+    for path in CORPUS:
+        raw = path.read_text(encoding="utf-8")
+        texts += [raw, clean_text(raw)]
+        names += [path.name, f"{path.name} (cleaned)"]
+
+    t0 = time.perf_counter()
+    expected = [textstat.flesch_reading_ease(t) for t in texts]
+    t1 = time.perf_counter()
+    actual = [flesch_reading_ease(t) for t in texts]
+    t2 = time.perf_counter()
+
+    failures = 0
+    for name, exp, got in zip(names, expected, actual):
+        diff = abs(got - exp)
+        failures += diff > FLESCH_TOLERANCE
+        print(f"{'FAIL' if diff > FLESCH_TOLERANCE else 'ok  '} {name:45s} textstat={exp:7.2f} built-in={got:7.2f} diff={diff:5.2f}")
+    print(f"{len(texts)} texts, tolerance {FLESCH_TOLERANCE}: textstat {t1 - t0:.3f}s, built-in {t2 - t1:.3f}s")
+    sys.exit(1 if failures else 0)
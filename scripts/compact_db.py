@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import delete, select, text, update
+
+from resume_analyzer.db import DB_PATH, AnalysisResult, Resume, JobDescription, SessionLocal, init_db, text_hash
+from resume_analyzer.parsers import clean_text
+
+# Analysis column pointing at each deduplicated table
+REFERENCES = ((Resume, AnalysisResult.resume_id), (JobDescription, AnalysisResult.jd_id))
+
+
+def backfill_hashes(sess, model, ref) -> int:
+    """Hash rows saved before content hashes existed; fold duplicates into one row.
+
+    Older versions stored raw, uncompressed text and a new row per analysis, so
+    rows are rewritten cleaned (and compressed), and analyses of duplicates are
+    repointed to the oldest copy.
+    """
+    kept = dict(sess.execute(select(model.content_hash, model.id).where(model.content_hash.is_not(None))).all())
+    legacy = sess.execute(select(model.id, model.text).where(model.content_hash.is_(None)).order_by(model.id)).all()
+    removed = 0
+    for row_id, value in legacy:
+        cleaned = clean_text(value)
+        digest = text_hash(cleaned)
+        if digest in kept:
+            sess.execute(update(AnalysisResult).where(ref == row_id).values({ref: kept[digest]}))
+            sess.execute(delete(model).where(model.id == row_id))
+            removed += 1
+        else:
+            sess.execute(update(model).where(model.id == row_id).values(text=cleaned, content_hash=digest))
+            kept[digest] = row_id
+    return removed
+
+
+# Rewrites rows stored before text compression and hashing were introduced, then reclaims space.
+if __name__ == "__main__":
+    engine = init_db()
+    before = DB_PATH.stat().st_size
+    with SessionLocal() as sess:
+        for model, ref in REFERENCES:
+            table = model.__tablename__
+            plain = sess.execute(text(f"SELECT count(*) FROM {table} WHERE typeof(text) = 'text'")).scalar_one()
+            removed = backfill_hashes(sess, model, ref)
+            print(f"{table}: compressed {plain} legacy rows, removed {removed} duplicates")
+        sess.commit()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    print(f"{DB_PATH}: {before} -> {DB_PATH.stat().st_size} bytes")
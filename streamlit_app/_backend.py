@@ -0,0 +1,243 @@
+"""Analysis backends for the dashboards.
+
+Two interchangeable implementations:
+- ``http``: POST uploads to the Flask API (default).
+- ``embedded``: run the ``resume_analyzer`` pipeline in this process, no API needed.
+
+Pick one with the ``ANALYZER_BACKEND`` secret or environment variable.
+"""
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from resume_analyzer.engine import composite_score, failed_extraction  # noqa: E402
+from resume_analyzer.parsers import Extraction  # noqa: E402
+
+# (filename, raw bytes) as returned by an uploaded file
+Upload = Tuple[str, bytes]
+# (filename, sha256) identifies an upload in cache keys
+UploadKey = Tuple[str, str]
+Progress = Callable[[float], None]
+
+
+class BackendError(Exception):
+    """Raised when a backend cannot produce a result; the message is user-facing."""
+
+
+def get_setting(name: str, default: str) -> str:
+    try:
+        # Will raise if secrets file is missing
+        return st.secrets[name]  # type: ignore[index]
+    except Exception:
+        return os.environ.get(name, default)
+
+
+def get_api_url() -> str:
+    return get_setting("API_URL", "http://localhost:8000")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def upload_key(upload: Upload) -> UploadKey:
+    return (upload[0], content_hash(upload[1]))
+
+
+def _int_setting(name: str, default: int) -> int:
+    try:
+        return max(1, int(get_setting(name, str(default))))
+    except ValueError:
+        return default
+
+
+RANK_CHUNK_SIZE = _int_setting("RANK_CHUNK_SIZE", 5)
+# Chunks in flight. The API takes RA_WORKERS x (RA_RANK_CONCURRENCY + RA_RANK_QUEUE)
+# /rank calls before answering 429; the default matches one worker's 1 + 2.
+RANK_WORKERS = _int_setting("RANK_WORKERS", 3)
+
+
+@st.cache_resource
+def _http_session() -> requests.Session:
+    """One keep-alive connection pool per Streamlit server, shared by all reruns."""
+    session = requests.Session()
+    # Only retry what is known not to have reached the analysis code: refused
+    # connections and 429s (the API rejects before doing any work). A read timeout
+    # or dropped connection may already have run, and persisted, the request.
+    retry = Retry(total=None, connect=2, read=0, other=0, status=3, backoff_factor=0.5,
+                  status_forcelist=(429,), allowed_methods=None,
+                  respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=RANK_WORKERS * 2, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _post(api_url: str, path: str, timeout: int, **kwargs) -> dict:
+    resp = _http_session().post(f"{api_url}{path}", timeout=timeout, **kwargs)
+    if resp.status_code != 200:
+        raise BackendError(f"API error: {resp.status_code} {resp.text}")
+    return resp.json()
+
+
+# /analyze is not cached: each call records an analysis, as with the embedded
+# backend (pages keep the last result in session_state across reruns). /rank
+# chunks are read-only, so they are cached on API URL + filenames + content
+# hashes; the underscore-prefixed payload arguments are skipped by st.cache_data hashing.
+@st.cache_data(show_spinner=False, max_entries=256)
+def _http_rank_chunk(api_url: str, jd_key: UploadKey, resume_keys: Tuple[UploadKey, ...],
+                     _jd: bytes, _resumes: Tuple[bytes, ...]) -> dict:
+    files = {"jd": (jd_key[0], _jd)}
+    for i, (key, data) in enumerate(zip(resume_keys, _resumes)):
+        files[f"resume_{i}"] = (key[0], data)
+    return _post(api_url, "/rank", 180, files=files)
+
+
+class HttpBackend:
+    name = "http"
+
+    def analyze(self, resume: Upload, jd: Optional[Upload] = None, jd_text: str = "") -> dict:
+        files = {"resume": resume}
+        data = {}
+        if jd is not None:
+            files["jd"] = jd
+        elif jd_text.strip():
+            data["jd_text"] = jd_text.strip()
+        return _post(get_api_url(), "/analyze", 120, files=files, data=data)
+
+    def rank(self, jd: Upload, resumes: List[Upload], progress: Optional[Progress] = None) -> dict:
+        """Post resumes in chunks of RANK_CHUNK_SIZE, RANK_WORKERS at a time, then merge.
+
+        Every chunk carries the same JD, so its keywords and scores are directly
+        comparable and the merged list only needs re-sorting.
+        """
+        api_url, jd_key = get_api_url(), upload_key(jd)
+        chunks = [resumes[i:i + RANK_CHUNK_SIZE] for i in range(0, len(resumes), RANK_CHUNK_SIZE)]
+        ctx = get_script_run_ctx()
+
+        def attach_ctx():
+            # lets the cached chunk calls run inside this script's session
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+        jd_keywords: List[str] = []
+        warnings: List[str] = []
+        results: List[dict] = []
+        with ThreadPoolExecutor(max_workers=min(RANK_WORKERS, len(chunks)) or 1, initializer=attach_ctx) as pool:
+            futures = [
+                pool.submit(_http_rank_chunk, api_url, jd_key, tuple(upload_key(f) for f in chunk),
+                            jd[1], tuple(data for _, data in chunk))
+                for chunk in chunks
+            ]
+            for done, fut in enumerate(as_completed(futures), start=1):
+                part = fut.result()
+                jd_keywords = jd_keywords or part["jd_keywords"]
+                # JD warnings repeat in every chunk
+                warnings = warnings or part.get("warnings", [])
+                results.extend(part["results"])
+                if progress:
+                    progress(done / len(futures))
+        results.sort(key=lambda r: composite_score(r["scores"]), reverse=True)
+        return {"jd_keywords": jd_keywords, "results": results, "warnings": warnings}
+
+
+@st.cache_resource(show_spinner="Loading analyzer...")
+def _embedded_engine():
+    from resume_analyzer import db as dbm
+    from resume_analyzer.engine import ResumeAnalyzer, parse_sections
+
+    dbm.init_db()
+    analyzer = ResumeAnalyzer(skills_sections=parse_sections(get_setting("RA_SKILLS_SECTIONS", "")))
+    analyzer.warm_up()
+    return analyzer
+
+
+# Cached functions are keyed on filenames + content hashes only; the
+# underscore-prefixed payload arguments are skipped by st.cache_data hashing.
+@st.cache_data(show_spinner=False, max_entries=128)
+def _embedded_analyze(resume_key: UploadKey, jd_key: Optional[UploadKey], jd_text: str,
+                      _resume: bytes, _jd: Optional[bytes]) -> Tuple[dict, str, str]:
+    """Analysis result plus the resume/JD texts it was computed from (for persisting)."""
+    analyzer = _embedded_engine()
+    resume = _embedded_parse(resume_key, _resume)
+    warnings = list(resume.warnings)
+    if jd_key is not None:
+        jd = _embedded_parse(jd_key, _jd)
+        jd_text = jd.text
+        warnings += jd.warnings
+    result = analyzer.analyze(resume.text, jd_text)
+    result["warnings"] = warnings
+    return result, resume.text, jd_text
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def _embedded_parse(key: UploadKey, _data: bytes) -> Extraction:
+    return _embedded_engine().extract(_data, key[0])
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _embedded_rank(jd_key: UploadKey, resume_keys: Tuple[UploadKey, ...],
+                   _jd: bytes, _resumes: Tuple[bytes, ...]) -> dict:
+    jd = _embedded_parse(jd_key, _jd)
+    resumes = []
+    for key, data in zip(resume_keys, _resumes):
+        try:
+            resumes.append((key[0], _embedded_parse(key, data)))
+        except (ValueError, RuntimeError) as e:
+            # reported on that resume, as by the API, instead of failing the batch
+            resumes.append((key[0], failed_extraction(key[0], e)))
+    result = _embedded_engine().rank(jd.text, resumes)
+    result["warnings"] = jd.warnings
+    return result
+
+
+class EmbeddedBackend:
+    name = "embedded"
+
+    def analyze(self, resume: Upload, jd: Optional[Upload] = None, jd_text: str = "") -> dict:
+        jd_key = upload_key(jd) if jd is not None else None
+        try:
+            result, resume_text, used_jd_text = _embedded_analyze(
+                upload_key(resume), jd_key, jd_text.strip() if jd is None else "",
+                resume[1], jd[1] if jd is not None else None,
+            )
+        except (ValueError, RuntimeError) as e:
+            raise BackendError(str(e)) from e
+        # Persist outside the cache so every analysis is recorded, as with the API
+        result.update(_embedded_engine().save_analysis(resume[0], resume_text, used_jd_text, result))
+        return result
+
+    def rank(self, jd: Upload, resumes: List[Upload], progress: Optional[Progress] = None) -> dict:
+        try:
+            data = _embedded_rank(
+                upload_key(jd), tuple(upload_key(f) for f in resumes),
+                jd[1], tuple(data for _, data in resumes),
+            )
+        except (ValueError, RuntimeError) as e:
+            raise BackendError(str(e)) from e
+        if progress:
+            progress(1.0)
+        return data
+
+
+BACKENDS = {"http": HttpBackend, "embedded": EmbeddedBackend}
+
+
+def get_backend():
+    name = get_setting("ANALYZER_BACKEND", "http").lower()
+    if name not in BACKENDS:
+        raise BackendError(f"Unknown ANALYZER_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -1,55 +1,62 @@
 import io
-import os
-import requests
 import streamlit as st
 import pandas as pd
 
+from _backend import BackendError, composite_score, get_backend
 
-def get_api_url() -> str:
-    try:
-        return st.secrets["API_URL"]  # type: ignore[index]
-    except Exception:
-        return os.environ.get("API_URL", "http://localhost:8000")
+
+def _clear_results():
+    st.session_state.pop("rank_result", None)
+
+
+def render_results(data: dict):
+    for warning in data.get("warnings", []) + [w for r in data["results"] for w in r.get("warnings", [])]:
+        st.warning(warning)
+    rows = []
+    for idx, r in enumerate(data["results"], start=1):
+        s = r["scores"]
+        score = composite_score(s)
+        rows.append({
+            "Rank": idx,
+            "Filename": r["filename"],
+            "Composite Score": round(score*100, 1),
+            "Similarity %": round(s["similarity"]*100, 1),
+            "Skill Match %": round(s["skill_match"]*100, 1),
+            "ATS %": round(s["ats_compliance"]*100, 1),
+        })
+    df = pd.DataFrame(rows)
+    st.dataframe(df, use_container_width=True)
+
+    csv_buf = io.StringIO()
+    df.to_csv(csv_buf, index=False)
+    st.download_button("Download CSV", data=csv_buf.getvalue(), file_name="ranked_candidates.csv", mime="text/csv")
 
 
 def run():
     st.set_page_config(page_title="Recruiter Dashboard", page_icon="🏢", layout="wide")
     st.title("🏢 Recruiter Dashboard")
 
-    jd_file = st.file_uploader("Upload Job Description (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="jd")
-    resumes = st.file_uploader("Upload Candidate Resumes (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], accept_multiple_files=True)
+    jd_file = st.file_uploader("Upload Job Description (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="jd", on_change=_clear_results)
+    resumes = st.file_uploader("Upload Candidate Resumes (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], accept_multiple_files=True, on_change=_clear_results)
 
     if st.button("Rank Candidates", type="primary"):
         if not jd_file or not resumes:
             st.error("Please upload a JD and at least one resume.")
         else:
-            with st.spinner("Ranking..."):
-                files = {"jd": (jd_file.name, jd_file.getvalue())}
-                for i, f in enumerate(resumes):
-                    files[f"resume_{i}"] = (f.name, f.getvalue())
-                try:
-                    resp = requests.post(f"{get_api_url()}/rank", files=files, timeout=180)
-                    if resp.status_code != 200:
-                        st.error(f"API error: {resp.status_code} {resp.text}")
-                    else:
-                        data = resp.json()
-                        rows = []
-                        for idx, r in enumerate(data["results"], start=1):
-                            s = r["scores"]
-                            score = s["similarity"] * 0.5 + s["skill_match"] * 0.3 + s["ats_compliance"] * 0.2
-                            rows.append({
-                                "Rank": idx,
-                                "Filename": r["filename"],
-                                "Composite Score": round(score*100, 1),
-                                "Similarity %": round(s["similarity"]*100, 1),
-                                "Skill Match %": round(s["skill_match"]*100, 1),
-                                "ATS %": round(s["ats_compliance"]*100, 1),
-                            })
-                        df = pd.DataFrame(rows)
-                        st.dataframe(df, use_container_width=True)
-
-                        csv_buf = io.StringIO()
-                        df.to_csv(csv_buf, index=False)
-                        st.download_button("Download CSV", data=csv_buf.getvalue(), file_name="ranked_candidates.csv", mime="text/csv")
-                except Exception as e:
-                    st.error(f"Request failed: {e}")
+            bar = st.progress(0.0, text=f"Ranking {len(resumes)} resumes...")
+            jd = (jd_file.name, jd_file.getvalue())
+            try:
+                st.session_state["rank_result"] = get_backend().rank(
+                    jd, [(f.name, f.getvalue()) for f in resumes],
+                    progress=lambda frac: bar.progress(frac, text=f"Ranking {len(resumes)} resumes... {frac:.0%}"),
+                )
+            except BackendError as e:
+                st.error(str(e))
+            except Exception as e:
+                st.error(f"Request failed: {e}")
+            finally:
+                bar.empty()
+
+    # Kept in session state so reruns (e.g. clicking "Download CSV") redraw without re-ranking
+    if "rank_result" in st.session_state:
+        render_results(st.session_state["rank_result"])
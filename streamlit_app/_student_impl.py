@@ -1,17 +1,40 @@
 import io
 import json
-import os
-import requests
 import streamlit as st
 import pandas as pd
 
+from _backend import BackendError, get_backend
 
-def get_api_url() -> str:
-    try:
-        # Will raise if secrets file is missing
-        return st.secrets["API_URL"]  # type: ignore[index]
-    except Exception:
-        return os.environ.get("API_URL", "http://localhost:8000")
+
+def _clear_results():
+    st.session_state.pop("analysis_result", None)
+
+
+def render_result(result: dict):
+    st.success("Analysis complete")
+    for warning in result.get("warnings", []):
+        st.warning(warning)
+    c1, c2, c3, c4, c5 = st.columns(5)
+    s = result["scores"]
+    c1.metric("Similarity", f"{s['similarity']*100:.0f}%")
+    c2.metric("Skill Match", f"{s['skill_match']*100:.0f}%")
+    c3.metric("Keyword Coverage", f"{s['keyword_coverage']*100:.0f}%")
+    c4.metric("Readability", f"{s['readability']*100:.0f}%")
+    c5.metric("ATS Compliance", f"{s['ats_compliance']*100:.0f}%")
+
+    st.markdown("### Missing / JD Keywords")
+    jd_kw = set(result.get("jd_keywords", []))
+    skills = set(result.get("skills", []))
+    missing = sorted([k for k in jd_kw if k.lower() not in (kw.lower() for kw in skills)])
+    df = pd.DataFrame({
+        "JD Keywords": list(jd_kw),
+        "Present in Resume": [k.lower() not in (kw.lower() for kw in missing) for k in jd_kw],
+    })
+    st.dataframe(df, use_container_width=True)
+
+    st.markdown("### Suggestions")
+    for tip in result.get("suggestions", []):
+        st.write("- ", tip)
 
 
 def run():
@@ -30,61 +53,30 @@ def run():
 
     col1, col2 = st.columns(2)
     with col1:
-        resume_file = st.file_uploader("Upload Resume (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="resume")
+        resume_file = st.file_uploader("Upload Resume (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="resume", on_change=_clear_results)
     with col2:
-        jd_option = st.radio("Provide Job Description", ["Upload JD file", "Paste JD text", "Skip"], horizontal=True)
+        jd_option = st.radio("Provide Job Description", ["Upload JD file", "Paste JD text", "Skip"], horizontal=True, on_change=_clear_results)
         jd_file = None
         jd_text = ""
         if jd_option == "Upload JD file":
-            jd_file = st.file_uploader("Upload JD (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="jd")
+            jd_file = st.file_uploader("Upload JD (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="jd", on_change=_clear_results)
         elif jd_option == "Paste JD text":
-            jd_text = st.text_area("Paste JD text", height=200)
+            jd_text = st.text_area("Paste JD text", height=200, on_change=_clear_results)
 
     if st.button("Analyze", type="primary"):
         if not resume_file:
             st.error("Please upload your resume.")
         else:
             with st.spinner("Analyzing..."):
-                files = {"resume": resume_file.getvalue()}
-                data = {}
-                if jd_file is not None:
-                    files["jd"] = jd_file.getvalue()
-                elif jd_text.strip():
-                    data["jd_text"] = jd_text
-
-                mfiles = {}
-                if "resume" in files:
-                    mfiles["resume"] = (resume_file.name, files["resume"])  # type: ignore
-                if "jd" in files:
-                    mfiles["jd"] = (jd_file.name, files["jd"])  # type: ignore
-
+                jd = (jd_file.name, jd_file.getvalue()) if jd_file is not None else None
                 try:
-                    resp = requests.post(f"{get_api_url()}/analyze", files=mfiles, data=data, timeout=120)
-                    if resp.status_code != 200:
-                        st.error(f"API error: {resp.status_code} {resp.text}")
-                    else:
-                        result = resp.json()
-                        st.success("Analysis complete")
-                        c1, c2, c3, c4, c5 = st.columns(5)
-                        s = result["scores"]
-                        c1.metric("Similarity", f"{s['similarity']*100:.0f}%")
-                        c2.metric("Skill Match", f"{s['skill_match']*100:.0f}%")
-                        c3.metric("Keyword Coverage", f"{s['keyword_coverage']*100:.0f}%")
-                        c4.metric("Readability", f"{s['readability']*100:.0f}%")
-                        c5.metric("ATS Compliance", f"{s['ats_compliance']*100:.0f}%")
-
-                        st.markdown("### Missing / JD Keywords")
-                        jd_kw = set(result.get("jd_keywords", []))
-                        skills = set(result.get("skills", []))
-                        missing = sorted([k for k in jd_kw if k.lower() not in (kw.lower() for kw in skills)])
-                        df = pd.DataFrame({
-                            "JD Keywords": list(jd_kw),
-                            "Present in Resume": [k.lower() not in (kw.lower() for kw in missing) for k in jd_kw],
-                        })
-                        st.dataframe(df, use_container_width=True)
-
-                        st.markdown("### Suggestions")
-                        for tip in result.get("suggestions", []):
-                            st.write("- ", tip)
+                    st.session_state["analysis_result"] = get_backend().analyze((resume_file.name, resume_file.getvalue()), jd, jd_text)
+                except BackendError as e:
+                    st.error(str(e))
                 except Exception as e:
                     st.error(f"Request failed: {e}")
+
+    # Kept in session state so unrelated reruns redraw the last analysis without re-posting
+    if "analysis_result" in st.session_state:
+        render_result(st.session_state["analysis_result"])
+